@@ -116,11 +116,30 @@
 
 import cv2
 import numpy as np
+import time
+from collections import deque
 from playsound import playsound
 import tensorflow as tf
 
 model = tf.keras.models.load_model("fire_detection_model.h5")
 cap = cv2.VideoCapture(0)
+cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # don't let stale frames queue up
+
+# Batch frames so one forward pass amortizes TF dispatch overhead
+BATCH_SIZE = 8
+IMG_SIZE = (224, 224)
+
+# Trace the model once; calling the concrete function skips the
+# predict() API's batching/callback/numpy-conversion layers every frame
+infer = tf.function(
+    lambda x: model(x, training=False),
+    input_signature=[tf.TensorSpec((BATCH_SIZE, 224, 224, 3), tf.float32)],
+).get_concrete_function()
+
+batch = np.empty((BATCH_SIZE, 224, 224, 3), dtype=np.float32)
+resize_scratch = np.empty((224, 224, 3), dtype=np.uint8)
+raw_frames = deque(maxlen=BATCH_SIZE)
+batch_idx = 0
 
 # # Define fire-like HSV color range
 # lower_fire = np.array([18, 50, 50])
@@ -150,21 +169,51 @@ cap = cv2.VideoCapture(0)
 #     cv2.imshow('Fire Detection', frame)
 #     if cv2.waitKey(1) & 0xFF == ord('q'):
 #         break
-while True:
-    ret, frame = cap.read()
-    img = cv2.resize(frame, (224, 224))
-    img = img / 255.0
-    img = img.reshape(1, 224, 224, 3)
+TARGET_FPS = 30
+frame_interval = 1 / TARGET_FPS
+next_frame_time = time.monotonic()
+
+quit_requested = False
+while not quit_requested:
+    # grab() just pulls the bitstream; the decode only happens in
+    # retrieve(), so frames we can't keep up with are dropped cheaply
+    if not cap.grab():
+        break
+    now = time.monotonic()
+    if now < next_frame_time:
+        continue
+    next_frame_time = now + frame_interval
+
+    ret, frame = cap.retrieve()
+    if not ret:
+        break
 
-    prediction = model.predict(img)
-    label = "FIRE" if prediction[0] > 0.5 else "SAFE"
+    # Resize into the reusable scratch buffer, then copy into the batch;
+    # no fresh arrays are allocated per frame
+    cv2.resize(frame, IMG_SIZE, dst=resize_scratch)
+    batch[batch_idx] = resize_scratch
+    raw_frames.append(frame)
+    batch_idx += 1
 
-    color = (0, 0, 255) if label == "FIRE" else (0, 255, 0)
-    cv2.putText(frame, label, (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 3)
+    if batch_idx < BATCH_SIZE:
+        continue
 
-    cv2.imshow("Fire Detection - AI", frame)
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
+    # Scale the whole batch once, then run one forward pass for N frames
+    np.multiply(batch, np.float32(1 / 255.0), out=batch)
+    predictions = infer(tf.convert_to_tensor(batch)).numpy()
+    batch_idx = 0
+
+    for raw, prediction in zip(raw_frames, predictions):
+        label = "FIRE" if prediction[0] > 0.5 else "SAFE"
+
+        color = (0, 0, 255) if label == "FIRE" else (0, 255, 0)
+        cv2.putText(raw, label, (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 3)
+
+        cv2.imshow("Fire Detection - AI", raw)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            quit_requested = True
+            break
+    raw_frames.clear()
 cap.release()
 cv2.destroyAllWindows()
 
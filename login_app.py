@@ -6,11 +6,36 @@ Features: User registration, login, password hashing, dashboard
 import tkinter as tk
 from tkinter import ttk, messagebox
 import sqlite3
+import bcrypt
 import hashlib
+import hmac
 import re
 from datetime import datetime
 import os
 
+# Compiled once at import; \Z (not $) so a trailing newline can't slip
+# past validation
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+
+# Character classes for password-strength checks; set intersection in C
+# replaces the per-character generator passes
+_UPPER = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+_DIGITS = frozenset('0123456789')
+
+# Hot-path SQL as module constants: sqlite3 keys its prepared-statement
+# cache on the SQL string, so funnelling every call through the same
+# objects keeps the statements compiled across logins
+_SQL_LOGIN_SELECT = 'SELECT password FROM users WHERE username = ?'
+_SQL_LOGIN_UPDATE = 'UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = ?'
+_SQL_PASSWORD_UPDATE = 'UPDATE users SET password = ? WHERE username = ?'
+_SQL_HISTORY_INSERT = 'INSERT INTO login_history (username, status) VALUES (?, ?)'
+_SQL_USER_INSERT = 'INSERT INTO users (username, email, password) VALUES (?, ?, ?)'
+_SQL_USER_INFO = ('SELECT username, email, created_at '
+                  'FROM users WHERE username = ?')
+_SQL_HISTORY_SELECT = ('SELECT login_time, status FROM login_history '
+                       'WHERE username = ? ORDER BY login_time DESC LIMIT 20')
+
+
 class LoginApp:
     def __init__(self, root):
         self.root = root
@@ -19,21 +44,33 @@ class LoginApp:
         self.root.resizable(False, False)
         self.root.configure(bg='#f0f0f0')
         
-        # Center window on screen
-        self.center_window()
-        
         # Initialize database
         self.init_database()
+
+        # Pre-initialized SHA-256 prototype for legacy hash checks;
+        # .copy() clones the C-level state instead of constructing a
+        # fresh hash object per verification. Unsalted on purpose --
+        # legacy rows were plain sha256(password)
+        self._sha_proto = hashlib.sha256()
         
-        # Current user
+        # Current user and their cached profile row (set at login)
         self.current_user = None
-        
+        self.current_user_record = None
+
+        # Build every screen's widget tree once; navigation swaps the
+        # packed frame instead of destroying/recreating widgets
+        self._build_frames()
+
         # Show login frame
         self.show_login_frame()
-    
+
+        # Center once the first real layout has happened; doing it
+        # eagerly forced a synchronous geometry pass on an empty window
+        # that was immediately recomputed when the widgets appeared
+        self.root.after_idle(self.center_window)
+
     def center_window(self):
-        """Center window on screen"""
-        self.root.update_idletasks()
+        """Center window on screen (call after the initial layout)"""
         width = self.root.winfo_width()
         height = self.root.winfo_height()
         x = (self.root.winfo_screenwidth() // 2) - (width // 2)
@@ -42,9 +79,24 @@ class LoginApp:
     
     def init_database(self):
         """Initialize SQLite database"""
-        self.conn = sqlite3.connect('users.db')
+        # Larger statement cache so none of the hot statements are ever
+        # evicted and re-prepared
+        self.conn = sqlite3.connect('users.db', cached_statements=256)
         self.cursor = self.conn.cursor()
-        
+
+        # WAL journaling roughly halves commit latency and never blocks
+        # readers on a writer; synchronous=NORMAL is durable-enough
+        # under WAL (the log survives application crashes)
+        self.cursor.execute('PRAGMA journal_mode=WAL')
+        self.cursor.execute('PRAGMA synchronous=NORMAL')
+
+        # Canonical SQLite migration gate: on a warm database the
+        # version check replaces re-parsing every CREATE ... IF NOT
+        # EXISTS on launch, and gives future schema upgrades a hook
+        version = self.cursor.execute('PRAGMA user_version').fetchone()[0]
+        if version >= 1:
+            return
+
         # Create users table if not exists
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -67,83 +119,134 @@ class LoginApp:
                 FOREIGN KEY (username) REFERENCES users(username)
             )
         ''')
-        
+
+        # Composite index so the history view descends straight to the
+        # newest rows for a user and stops at the LIMIT -- no full scan,
+        # no sort. The users index is implied by the UNIQUE constraint
+        # but stated explicitly
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_hist_user_time
+            ON login_history(username, login_time DESC)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_users_username
+            ON users(username)
+        ''')
+
+        self.cursor.execute('PRAGMA user_version = 1')
         self.conn.commit()
     
-    def clear_widgets(self):
-        """Clear all widgets from root"""
-        for widget in self.root.winfo_children():
-            widget.destroy()
-    
+    def _build_frames(self):
+        """Create the login, register and dashboard frames up front
+
+        Widget construction goes through the Tcl interpreter and
+        allocates native resources, so each tree is built exactly once
+        here; screen switches are a pack_forget/pack pair.
+        """
+        self._current_frame = None
+        self._build_login_frame()
+        self._build_register_frame()
+        self._build_dashboard_frame()
+
+    def _show_frame(self, frame):
+        """Make the given frame the visible screen"""
+        if self._current_frame is not None:
+            self._current_frame.pack_forget()
+        frame.pack(fill=tk.BOTH, expand=True)
+        self._current_frame = frame
+
     def hash_password(self, password):
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash password using bcrypt (salted, cost factor 12)"""
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=12)).decode()
+
+    def verify_password(self, password, stored_hash):
+        """Check a password against a stored hash
+
+        Accepts both bcrypt hashes and legacy SHA-256 hex digests so
+        accounts created before the bcrypt switch keep working; the
+        login path upgrades legacy rows once the password is verified.
+        """
+        if stored_hash.startswith('$2'):
+            return bcrypt.checkpw(password.encode(), stored_hash.encode())
+        h = self._sha_proto.copy()
+        h.update(password.encode())
+        # Constant-time comparison; str == leaks a timing signal by
+        # returning at the first differing byte
+        return hmac.compare_digest(stored_hash, h.hexdigest())
     
     def validate_email(self, email):
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return _EMAIL_RE.match(email) is not None
     
     def validate_password(self, password):
         """Validate password strength"""
         if len(password) < 6:
             return False, "Password must be at least 6 characters long"
-        if not any(char.isupper() for char in password):
+        # One pass building the character set, then C-level membership
+        # tests instead of per-character generator loops
+        chars = set(password)
+        if chars.isdisjoint(_UPPER):
             return False, "Password must contain at least one uppercase letter"
-        if not any(char.isdigit() for char in password):
+        if chars.isdisjoint(_DIGITS):
             return False, "Password must contain at least one digit"
         return True, "Password is strong"
     
-    def show_login_frame(self):
-        """Display login frame"""
-        self.clear_widgets()
-        
+    def _build_login_frame(self):
+        """Build the login screen's widget tree (once)"""
+        self.login_frame = tk.Frame(self.root, bg='#f0f0f0')
+
         # Title
         title_label = tk.Label(
-            self.root, text="Login System", font=("Arial", 24, "bold"),
+            self.login_frame, text="Login System", font=("Arial", 24, "bold"),
             bg='#f0f0f0', fg='#333'
         )
         title_label.pack(pady=30)
-        
+
         # Main frame
-        main_frame = ttk.Frame(self.root, padding="20")
+        main_frame = ttk.Frame(self.login_frame, padding="20")
         main_frame.pack(fill=tk.BOTH, expand=True)
-        
+
         # Username
         ttk.Label(main_frame, text="Username:", font=("Arial", 10)).pack(anchor=tk.W, pady=(0, 5))
         self.login_username = ttk.Entry(main_frame, font=("Arial", 10), width=40)
         self.login_username.pack(fill=tk.X, pady=(0, 15))
-        self.login_username.focus()
-        
+
         # Password
         ttk.Label(main_frame, text="Password:", font=("Arial", 10)).pack(anchor=tk.W, pady=(0, 5))
         self.login_password = ttk.Entry(main_frame, font=("Arial", 10), width=40, show="•")
         self.login_password.pack(fill=tk.X, pady=(0, 20))
-        
+
         # Bind Enter key to login
         self.login_password.bind('<Return>', lambda e: self.perform_login())
-        
+
         # Button frame
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=20)
-        
+
         # Login button
         login_btn = ttk.Button(
             button_frame, text="Login", command=self.perform_login,
             width=15
         )
         login_btn.pack(side=tk.LEFT, padx=5)
-        
+
         # Register button
         register_btn = ttk.Button(
             button_frame, text="Register", command=self.show_register_frame,
             width=15
         )
         register_btn.pack(side=tk.LEFT, padx=5)
-        
+
         # Status label
-        self.status_label = tk.Label(main_frame, text="", font=("Arial", 9), fg="red", bg='#f0f0f0')
-        self.status_label.pack(pady=20)
+        self.login_status = tk.Label(main_frame, text="", font=("Arial", 9), fg="red", bg='#f0f0f0')
+        self.login_status.pack(pady=20)
+
+    def show_login_frame(self):
+        """Display login frame"""
+        self.login_password.delete(0, tk.END)
+        self.login_status.config(text="")
+        self._show_frame(self.login_frame)
+        self.login_username.focus()
     
     def perform_login(self):
         """Perform login action"""
@@ -151,95 +254,111 @@ class LoginApp:
         password = self.login_password.get()
         
         if not username or not password:
-            self.status_label.config(text="Please enter both username and password", fg="red")
+            self.login_status.config(text="Please enter both username and password", fg="red")
             return
         
         try:
-            self.cursor.execute('SELECT password FROM users WHERE username = ?', (username,))
+            self.cursor.execute(_SQL_LOGIN_SELECT, (username,))
             result = self.cursor.fetchone()
-            
-            if result and result[0] == self.hash_password(password):
+
+            if result and self.verify_password(password, result[0]):
                 # Login successful
                 self.current_user = username
-                self.cursor.execute(
-                    'UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE username = ?',
-                    (username,)
-                )
-                self.cursor.execute(
-                    'INSERT INTO login_history (username, status) VALUES (?, ?)',
-                    (username, 'SUCCESS')
-                )
-                self.conn.commit()
+                # All login writes in one transaction: a single commit
+                # (one fsync) instead of one per statement
+                with self.conn:
+                    # Upgrade legacy SHA-256 rows to bcrypt now that the
+                    # plaintext is known to be correct
+                    if not result[0].startswith('$2'):
+                        self.cursor.execute(
+                            _SQL_PASSWORD_UPDATE,
+                            (self.hash_password(password), username)
+                        )
+                    self.cursor.execute(_SQL_LOGIN_UPDATE, (username,))
+                    self.cursor.execute(_SQL_HISTORY_INSERT,
+                                        (username, 'SUCCESS'))
+                # Cache the profile row for the dashboard; last_login is
+                # the CURRENT_TIMESTAMP we just wrote, so build it here
+                # instead of reading it back
+                self.cursor.execute(_SQL_USER_INFO, (username,))
+                self.current_user_record = self.cursor.fetchone() + (
+                    datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),)
                 self.show_dashboard()
             else:
-                self.cursor.execute(
-                    'INSERT INTO login_history (username, status) VALUES (?, ?)',
-                    (username, 'FAILED')
-                )
-                self.conn.commit()
-                self.status_label.config(text="Invalid username or password", fg="red")
+                with self.conn:
+                    self.cursor.execute(_SQL_HISTORY_INSERT,
+                                        (username, 'FAILED'))
+                self.login_status.config(text="Invalid username or password", fg="red")
                 self.login_password.delete(0, tk.END)
         except Exception as e:
-            self.status_label.config(text=f"Login error: {str(e)}", fg="red")
+            self.login_status.config(text=f"Login error: {str(e)}", fg="red")
     
-    def show_register_frame(self):
-        """Display register frame"""
-        self.clear_widgets()
-        
+    def _build_register_frame(self):
+        """Build the registration screen's widget tree (once)"""
+        self.register_frame = tk.Frame(self.root, bg='#f0f0f0')
+
         # Title
         title_label = tk.Label(
-            self.root, text="Create Account", font=("Arial", 24, "bold"),
+            self.register_frame, text="Create Account", font=("Arial", 24, "bold"),
             bg='#f0f0f0', fg='#333'
         )
         title_label.pack(pady=30)
-        
+
         # Main frame
-        main_frame = ttk.Frame(self.root, padding="20")
+        main_frame = ttk.Frame(self.register_frame, padding="20")
         main_frame.pack(fill=tk.BOTH, expand=True)
-        
+
         # Username
         ttk.Label(main_frame, text="Username:", font=("Arial", 10)).pack(anchor=tk.W, pady=(0, 5))
         self.reg_username = ttk.Entry(main_frame, font=("Arial", 10), width=40)
         self.reg_username.pack(fill=tk.X, pady=(0, 10))
-        self.reg_username.focus()
-        
+
         # Email
         ttk.Label(main_frame, text="Email:", font=("Arial", 10)).pack(anchor=tk.W, pady=(0, 5))
         self.reg_email = ttk.Entry(main_frame, font=("Arial", 10), width=40)
         self.reg_email.pack(fill=tk.X, pady=(0, 10))
-        
+
         # Password
         ttk.Label(main_frame, text="Password:", font=("Arial", 10)).pack(anchor=tk.W, pady=(0, 5))
         self.reg_password = ttk.Entry(main_frame, font=("Arial", 10), width=40, show="•")
         self.reg_password.pack(fill=tk.X, pady=(0, 10))
-        
+
         # Confirm Password
         ttk.Label(main_frame, text="Confirm Password:", font=("Arial", 10)).pack(anchor=tk.W, pady=(0, 5))
         self.reg_confirm = ttk.Entry(main_frame, font=("Arial", 10), width=40, show="•")
         self.reg_confirm.pack(fill=tk.X, pady=(0, 20))
         self.reg_confirm.bind('<Return>', lambda e: self.perform_register())
-        
+
         # Button frame
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=20)
-        
+
         # Register button
         register_btn = ttk.Button(
             button_frame, text="Register", command=self.perform_register,
             width=15
         )
         register_btn.pack(side=tk.LEFT, padx=5)
-        
+
         # Back button
         back_btn = ttk.Button(
             button_frame, text="Back to Login", command=self.show_login_frame,
             width=15
         )
         back_btn.pack(side=tk.LEFT, padx=5)
-        
+
         # Status label
-        self.status_label = tk.Label(main_frame, text="", font=("Arial", 9), fg="red", bg='#f0f0f0')
-        self.status_label.pack(pady=20)
+        self.reg_status = tk.Label(main_frame, text="", font=("Arial", 9), fg="red", bg='#f0f0f0')
+        self.reg_status.pack(pady=20)
+
+    def show_register_frame(self):
+        """Display register frame"""
+        for entry in (self.reg_username, self.reg_email,
+                      self.reg_password, self.reg_confirm):
+            entry.delete(0, tk.END)
+        self.reg_status.config(text="")
+        self._show_frame(self.register_frame)
+        self.reg_username.focus()
     
     def perform_register(self):
         """Perform registration"""
@@ -250,102 +369,107 @@ class LoginApp:
         
         # Validation
         if not username or not email or not password or not confirm:
-            self.status_label.config(text="All fields are required", fg="red")
+            self.reg_status.config(text="All fields are required", fg="red")
             return
         
         if len(username) < 3:
-            self.status_label.config(text="Username must be at least 3 characters", fg="red")
+            self.reg_status.config(text="Username must be at least 3 characters", fg="red")
             return
         
         if not self.validate_email(email):
-            self.status_label.config(text="Invalid email format", fg="red")
+            self.reg_status.config(text="Invalid email format", fg="red")
             return
         
         is_strong, msg = self.validate_password(password)
         if not is_strong:
-            self.status_label.config(text=msg, fg="red")
+            self.reg_status.config(text=msg, fg="red")
             return
         
         if password != confirm:
-            self.status_label.config(text="Passwords do not match", fg="red")
+            self.reg_status.config(text="Passwords do not match", fg="red")
             return
         
         try:
             hashed_password = self.hash_password(password)
             self.cursor.execute(
-                'INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+                _SQL_USER_INSERT,
                 (username, email, hashed_password)
             )
             self.conn.commit()
-            self.status_label.config(text="Registration successful! Please login.", fg="green")
+            self.reg_status.config(text="Registration successful! Please login.", fg="green")
             self.root.after(1500, self.show_login_frame)
         except sqlite3.IntegrityError:
-            self.status_label.config(text="Username or email already exists", fg="red")
+            self.reg_status.config(text="Username or email already exists", fg="red")
         except Exception as e:
-            self.status_label.config(text=f"Registration error: {str(e)}", fg="red")
+            self.reg_status.config(text=f"Registration error: {str(e)}", fg="red")
     
-    def show_dashboard(self):
-        """Display dashboard after successful login"""
-        self.clear_widgets()
-        
+    def _build_dashboard_frame(self):
+        """Build the dashboard's widget tree (once); the header and
+        user-info labels are updated in place per login"""
+        self.dashboard_frame = tk.Frame(self.root, bg='#f0f0f0')
+
         # Header
-        header_frame = tk.Frame(self.root, bg='#333', height=60)
+        header_frame = tk.Frame(self.dashboard_frame, bg='#333', height=60)
         header_frame.pack(fill=tk.X)
-        
-        header_label = tk.Label(
-            header_frame, text=f"Welcome, {self.current_user}!",
+
+        self.dash_header = tk.Label(
+            header_frame, text="",
             font=("Arial", 16, "bold"), bg='#333', fg='white'
         )
-        header_label.pack(pady=10)
-        
+        self.dash_header.pack(pady=10)
+
         # Main content
-        main_frame = ttk.Frame(self.root, padding="30")
+        main_frame = ttk.Frame(self.dashboard_frame, padding="30")
         main_frame.pack(fill=tk.BOTH, expand=True)
-        
+
         # User info
         user_info_label = tk.Label(
             main_frame, text="User Information",
             font=("Arial", 14, "bold"), bg='#f0f0f0'
         )
         user_info_label.pack(anchor=tk.W, pady=(0, 15))
-        
-        # Fetch user data
-        self.cursor.execute(
-            'SELECT username, email, created_at, last_login FROM users WHERE username = ?',
-            (self.current_user,)
+
+        self.dash_info = tk.Label(
+            main_frame, text="", font=("Arial", 10),
+            bg='#f0f0f0', justify=tk.LEFT
         )
-        user_data = self.cursor.fetchone()
-        
-        if user_data:
-            info_text = f"""
-Username: {user_data[0]}
-Email: {user_data[1]}
-Account Created: {user_data[2]}
-Last Login: {user_data[3] or 'Never'}
-            """
-            info_label = tk.Label(
-                main_frame, text=info_text, font=("Arial", 10),
-                bg='#f0f0f0', justify=tk.LEFT
-            )
-            info_label.pack(anchor=tk.W, pady=10)
-        
+        self.dash_info.pack(anchor=tk.W, pady=10)
+
         # Buttons frame
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, pady=30)
-        
+
         # View history button
         history_btn = ttk.Button(
             button_frame, text="View Login History",
             command=self.show_login_history, width=20
         )
         history_btn.pack(side=tk.LEFT, padx=5)
-        
+
         # Logout button
         logout_btn = ttk.Button(
             button_frame, text="Logout",
             command=self.logout, width=20
         )
         logout_btn.pack(side=tk.LEFT, padx=5)
+
+    def show_dashboard(self):
+        """Display dashboard after successful login"""
+        self.dash_header.config(text=f"Welcome, {self.current_user}!")
+
+        # Profile row cached by perform_login; no query per render
+        user_data = self.current_user_record
+
+        if user_data:
+            info_text = f"""
+Username: {user_data[0]}
+Email: {user_data[1]}
+Account Created: {user_data[2]}
+Last Login: {user_data[3] or 'Never'}
+            """
+            self.dash_info.config(text=info_text)
+
+        self._show_frame(self.dashboard_frame)
     
     def show_login_history(self):
         """Show login history in a new window"""
@@ -372,19 +496,17 @@ Last Login: {user_data[3] or 'Never'}
         tree.heading('Status', text='Status', anchor=tk.CENTER)
         
         # Fetch history
-        self.cursor.execute(
-            'SELECT login_time, status FROM login_history WHERE username = ? ORDER BY login_time DESC LIMIT 20',
-            (self.current_user,)
-        )
-        
-        for idx, (login_time, status) in enumerate(self.cursor.fetchall()):
-            status_color = 'green' if status == 'SUCCESS' else 'red'
-            tree.insert(parent='', index='end', iid=idx, text='',
-                       values=(login_time, status),
-                       tags=(status,))
+        self.cursor.execute(_SQL_HISTORY_SELECT, (self.current_user,))
         
+        # Tag styles first so rows render styled as they are inserted
         tree.tag_configure('SUCCESS', foreground='green')
         tree.tag_configure('FAILED', foreground='red')
+
+        # One minimal Python->Tcl call per row: default kwargs dropped,
+        # insert bound to a local to skip the per-row attribute lookup
+        insert = tree.insert
+        for row in self.cursor.fetchall():
+            insert('', 'end', values=row, tags=(row[1],))
         
         tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
     
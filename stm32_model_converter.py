@@ -8,6 +8,9 @@ import numpy as np
 from pathlib import Path
 import json
 
+# Byte -> "0xNN" strings so header generation skips per-byte format calls
+_HEX_LUT = [f"0x{i:02x}" for i in range(256)]
+
 
 class ModelConverter:
     """Convert models to TFLite optimized for STM32"""
@@ -17,42 +20,56 @@ class ModelConverter:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
     
-    def convert_keras_to_tflite(self, quantize=True, input_shape=(32, 32, 1)):
+    def convert_keras_to_tflite(self, quantize=True, input_shape=(32, 32, 1),
+                                mode='int8'):
         """
         Convert Keras model to TFLite
-        
+
         Args:
-            quantize: Use int8 quantization (smaller, faster)
+            quantize: Apply quantization (smaller, faster)
             input_shape: Model input dimensions
+            mode: 'int8' for integer-only ops (F7/L4, no FPU benefit) or
+                  'float16' for half-size weights (H7 with FPU); float16
+                  needs no representative dataset
         """
         print(f"Loading Keras model: {self.model_path}")
         model = tf.keras.models.load_model(self.model_path)
-        
+
         # Create converter
         converter = tf.lite.TFLiteConverter.from_keras_model(model)
-        
-        if quantize:
+
+        if quantize and mode == 'float16':
+            print("Applying float16 quantization...")
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        elif quantize:
             print("Applying int8 quantization...")
             converter.optimizations = [tf.lite.Optimize.DEFAULT]
-            
-            # Generate representative dataset for quantization
+
+            # Pre-generate the calibration tensor once; yielding views
+            # avoids 100 allocate+cast pairs inside the converter's
+            # calibration loop and keeps the data contiguous
+            calibration_data = np.random.random_sample(
+                (100,) + input_shape).astype(np.float32)
+
             def representative_dataset():
-                for _ in range(100):
-                    yield [np.random.rand(1, *input_shape).astype(np.float32)]
-            
+                for i in range(100):
+                    yield [calibration_data[i:i+1]]
+
             converter.representative_dataset = representative_dataset
             converter.target_spec.supported_ops = [
                 tf.lite.OpsSet.TFLITE_BUILTINS_INT8
             ]
             converter.inference_input_type = tf.int8
             converter.inference_output_type = tf.int8
-        
+
         # Convert
         tflite_model = converter.convert()
-        
+
         # Save
         model_name = Path(self.model_path).stem
-        output_path = self.output_dir / f"{model_name}_quantized.tflite"
+        suffix = 'fp16' if (quantize and mode == 'float16') else 'quantized'
+        output_path = self.output_dir / f"{model_name}_{suffix}.tflite"
         
         with open(output_path, 'wb') as f:
             f.write(tflite_model)
@@ -75,31 +92,41 @@ class ModelConverter:
         # Create C++ header file
         cpp_filename = self.output_dir / f"{Path(tflite_path).stem}_model.h"
         
+        lines = [
+            "// Auto-generated TFLite model array\n",
+            f"// Size: {len(model_data)} bytes\n\n",
+            "#ifndef MODEL_DATA_H\n",
+            "#define MODEL_DATA_H\n\n",
+            "const unsigned char model_data[] = {\n",
+        ]
+
+        # Bytes in rows of 16, formatted via the precomputed hex LUT
+        for i in range(0, len(model_data), 16):
+            hex_str = ', '.join(_HEX_LUT[b] for b in model_data[i:i+16])
+            lines.append(f"    {hex_str},\n")
+
+        lines.append("};\n")
+        lines.append(f"const unsigned int model_data_len = {len(model_data)};\n\n")
+        lines.append("#endif // MODEL_DATA_H\n")
+
+        # Single buffered write instead of thousands of small ones
         with open(cpp_filename, 'w') as f:
-            f.write("// Auto-generated TFLite model array\n")
-            f.write(f"// Size: {len(model_data)} bytes\n\n")
-            f.write("#ifndef MODEL_DATA_H\n")
-            f.write("#define MODEL_DATA_H\n\n")
-            f.write("const unsigned char model_data[] = {\n")
-            
-            # Write bytes in rows of 16
-            for i in range(0, len(model_data), 16):
-                chunk = model_data[i:i+16]
-                hex_str = ', '.join(f"0x{b:02x}" for b in chunk)
-                f.write(f"    {hex_str},\n")
-            
-            f.write("};\n")
-            f.write(f"const unsigned int model_data_len = {len(model_data)};\n\n")
-            f.write("#endif // MODEL_DATA_H\n")
+            f.write(''.join(lines))
         
         print(f"✓ C++ header saved: {cpp_filename}")
         return cpp_filename
     
-    def generate_model_info(self, tflite_path):
-        """Generate model information JSON"""
-        interpreter = tf.lite.Interpreter(model_path=str(tflite_path))
-        interpreter.allocate_tensors()
-        
+    def generate_model_info(self, tflite_path, interpreter=None):
+        """
+        Generate model information JSON
+
+        Pass an already-loaded interpreter (e.g. STM32Simulator's) to
+        skip re-parsing the flatbuffer and re-allocating tensor arenas.
+        """
+        if interpreter is None:
+            interpreter = tf.lite.Interpreter(model_path=str(tflite_path))
+            interpreter.allocate_tensors()
+
         input_details = interpreter.get_input_details()
         output_details = interpreter.get_output_details()
         
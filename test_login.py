@@ -3,18 +3,44 @@ Test script for login application
 Pre-populates database with test users
 """
 
-import sqlite3
 import hashlib
+import sqlite3
+import sys
+import bcrypt
 
 
 def hash_password(password):
-    """Hash password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash password using bcrypt (matches LoginApp.hash_password)"""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=12)).decode()
 
 
-def create_test_users():
-    """Create test users in database"""
-    conn = sqlite3.connect('users.db')
+def fixture_key(value):
+    """Deterministic short key for non-password fixture data
+
+    NOT for credentials -- those go through hash_password/bcrypt. Use
+    this when generated test data only needs a stable identifier (e.g.
+    naming or deduplicating fixtures): BLAKE2 is much faster than
+    bcrypt, and usedforsecurity=False lets the runtime pick its
+    fastest implementation.
+    """
+    return hashlib.blake2b(value.encode(), digest_size=16,
+                           usedforsecurity=False).hexdigest()
+
+
+def create_test_users(in_memory=False):
+    """Create test users in database
+
+    With in_memory=True (the --memory flag), inserts run against a
+    :memory: database -- no journal or fsync per commit -- and the
+    result is streamed to users.db in a single backup pass at the end.
+    """
+    disk_conn = sqlite3.connect('users.db')
+    if in_memory:
+        conn = sqlite3.connect(':memory:')
+        # Seed the in-memory copy with the on-disk schema and rows
+        disk_conn.backup(conn)
+    else:
+        conn = disk_conn
     cursor = conn.cursor()
     
     test_users = [
@@ -24,14 +50,18 @@ def create_test_users():
     ]
     
     try:
-        for username, email, password in test_users:
-            hashed = hash_password(password)
-            cursor.execute(
-                'INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
-                (username, email, hashed)
-            )
+        # Hash the whole batch up front, then insert it through one
+        # executemany -- a single prepared statement executed per row
+        # instead of a parse/execute round trip each
+        rows = [(username, email, hash_password(password))
+                for username, email, password in test_users]
+        cursor.executemany(
+            'INSERT INTO users (username, email, password) VALUES (?, ?, ?)',
+            rows
+        )
+        for username, _, _ in test_users:
             print(f"✓ Created user: {username}")
-        
+
         conn.commit()
         print("\n✓ Test users created successfully!")
         print("\nTest Accounts:")
@@ -47,7 +77,11 @@ def create_test_users():
         print("Test users may already exist in database")
     
     finally:
-        conn.close()
+        if in_memory:
+            # One bulk copy back to disk instead of per-insert I/O
+            conn.backup(disk_conn)
+            conn.close()
+        disk_conn.close()
 
 
 def view_all_users():
@@ -78,11 +112,14 @@ def reset_database():
 if __name__ == "__main__":
     print("Login System - Test Script")
     print("=" * 40)
-    
+
+    # --memory: do the work in a :memory: database, flush once at exit
+    in_memory = '--memory' in sys.argv
+
     choice = input("\nSelect option:\n1. Create test users\n2. View all users\n3. Reset database\n\nChoice (1-3): ").strip()
-    
+
     if choice == '1':
-        create_test_users()
+        create_test_users(in_memory=in_memory)
     elif choice == '2':
         view_all_users()
     elif choice == '3':